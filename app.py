@@ -6,83 +6,186 @@ Visualisation interactive avec paramètres géographiques RÉALISTES.
 Calibré sur les données réelles de la Terre.
 """
 
-from flask import Flask, render_template, jsonify, request
-from flask_cors import CORS
+from flask import Flask, Response, render_template, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+import os
 import random
 import math
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field, fields
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:  # orjson est optionnel : repli sur le json standard
+    orjson = None
+
+try:
+    from flask_compress import Compress
+except ImportError:  # flask-compress est optionnel : réponses non compressées
+    Compress = None
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Sérialisation JSON via orjson (encodeur C, bien plus rapide que json)."""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # Octets orjson envoyés tels quels (sans aller-retour bytes -> str -> bytes)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
 app = Flask(__name__)
-CORS(app)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+else:
+    # json standard : ni tri des clés ni indentation, même en debug
+    app.json.sort_keys = False
+    app.json.compact = True
+if Compress is not None:
+    # Brotli/gzip niveau 4 : gain réseau élevé sur le JSON répétitif, CPU faible
+    app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+    app.config["COMPRESS_LEVEL"] = 4
+    app.config["COMPRESS_BR_LEVEL"] = 4
+    app.config["COMPRESS_MIN_SIZE"] = 512
+    Compress(app)
+
+@app.after_request
+def cors(response):
+    """CORS ouvert : en-têtes statiques (les OPTIONS sont gérés par Flask)."""
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    response.headers["Access-Control-Allow-Headers"] = "Content-Type"
+    response.headers["Access-Control-Allow-Methods"] = "GET, POST, OPTIONS"
+    return response
 
 # ============================================================================
 # PARAMÈTRES GÉOGRAPHIQUES RÉALISTES
 # ============================================================================
 
+@dataclass(frozen=True, slots=True)
+class Echelle:
+    """Paramètres immuables d'une échelle géographique."""
+    nom: str
+    superficie_km2: int
+    grille: int
+    cellule_km: float
+    vitesse_humain_kmh: int
+    vitesse_ia_kmh: int
+    temps_par_tour_min: int
+    description: str
+    # Dérivés, précalculés à l'import : déplacement en cellules par tour
+    deplacement_humain: float = field(init=False)
+    deplacement_ia: float = field(init=False)
+    
+    def __post_init__(self):
+        heures_par_tour = self.temps_par_tour_min / 60
+        object.__setattr__(self, "deplacement_humain", self.vitesse_humain_kmh * heures_par_tour / self.cellule_km)
+        object.__setattr__(self, "deplacement_ia", self.vitesse_ia_kmh * heures_par_tour / self.cellule_km)
+    
+    def to_dict(self) -> dict:
+        """Champs publics (ceux du constructeur), sans les dérivés internes."""
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+
 class EchelleGeographique:
     """Échelles géographiques avec données réelles calibrées."""
     
     ECHELLES = {
-        "ville": {
-            "nom": "Ville (Paris)",
-            "superficie_km2": 105,
-            "grille": 15,
-            "cellule_km": 0.68,
-            "vitesse_humain_kmh": 5,
-            "vitesse_ia_kmh": 50,
-            "temps_par_tour_min": 10,
-            "description": "Zone urbaine dense"
-        },
-        "region": {
-            "nom": "Région (Île-de-France)",
-            "superficie_km2": 12012,
-            "grille": 15,
-            "cellule_km": 7.3,
-            "vitesse_humain_kmh": 5,
-            "vitesse_ia_kmh": 200,
-            "temps_par_tour_min": 60,
-            "description": "Zone régionale"
-        },
-        "pays": {
-            "nom": "Pays (France)",
-            "superficie_km2": 643801,
-            "grille": 15,
-            "cellule_km": 53.5,
-            "vitesse_humain_kmh": 5,
-            "vitesse_ia_kmh": 500,
-            "temps_par_tour_min": 360,
-            "description": "Échelle nationale"
-        },
-        "continent": {
-            "nom": "Continent (Europe)",
-            "superficie_km2": 10180000,
-            "grille": 15,
-            "cellule_km": 213,
-            "vitesse_humain_kmh": 5,
-            "vitesse_ia_kmh": 800,
-            "temps_par_tour_min": 1440,
-            "description": "Échelle continentale"
-        },
-        "monde": {
-            "nom": "Monde (Terre habitable)",
-            "superficie_km2": 150000000,
-            "grille": 15,
-            "cellule_km": 816,
-            "vitesse_humain_kmh": 5,
-            "vitesse_ia_kmh": 1000,
-            "temps_par_tour_min": 4320,
-            "description": "Échelle planétaire"
-        }
+        "ville": Echelle(
+            nom="Ville (Paris)",
+            superficie_km2=105,
+            grille=15,
+            cellule_km=0.68,
+            vitesse_humain_kmh=5,
+            vitesse_ia_kmh=50,
+            temps_par_tour_min=10,
+            description="Zone urbaine dense"
+        ),
+        "region": Echelle(
+            nom="Région (Île-de-France)",
+            superficie_km2=12012,
+            grille=15,
+            cellule_km=7.3,
+            vitesse_humain_kmh=5,
+            vitesse_ia_kmh=200,
+            temps_par_tour_min=60,
+            description="Zone régionale"
+        ),
+        "pays": Echelle(
+            nom="Pays (France)",
+            superficie_km2=643801,
+            grille=15,
+            cellule_km=53.5,
+            vitesse_humain_kmh=5,
+            vitesse_ia_kmh=500,
+            temps_par_tour_min=360,
+            description="Échelle nationale"
+        ),
+        "continent": Echelle(
+            nom="Continent (Europe)",
+            superficie_km2=10180000,
+            grille=15,
+            cellule_km=213,
+            vitesse_humain_kmh=5,
+            vitesse_ia_kmh=800,
+            temps_par_tour_min=1440,
+            description="Échelle continentale"
+        ),
+        "monde": Echelle(
+            nom="Monde (Terre habitable)",
+            superficie_km2=150000000,
+            grille=15,
+            cellule_km=816,
+            vitesse_humain_kmh=5,
+            vitesse_ia_kmh=1000,
+            temps_par_tour_min=4320,
+            description="Échelle planétaire"
+        )
     }
     
     @classmethod
-    def get(cls, echelle: str) -> dict:
+    def get(cls, echelle: str) -> Echelle:
         return cls.ECHELLES.get(echelle, cls.ECHELLES["pays"])
 
 # ============================================================================
 # CLASSES DE SIMULATION
 # ============================================================================
 
+# Consommation d'énergie de l'IA : 1% par 50 km (2% par 100 km)
+COUT_ENERGIE_PAR_KM = 1.0 / 50.0
+COUT_ALLER_RETOUR_PAR_KM = 2 * COUT_ENERGIE_PAR_KM
+
+def borner(v: float, hi: float) -> float:
+    """Ramène v dans [0, hi] sans passer par deux appels max/min."""
+    return 0.0 if v < 0 else hi if v > hi else v
+
+# Compteurs des STATISTIQUES MULTI-SIMULATIONS (ordre conservé dans le JSON)
+STATS_CHAMPS = (
+    "total_simulations",
+    "a_survit",  # Enfant survit
+    "b_survit",  # Adulte survit
+    "deux_survivent",
+    "deux_morts",
+    "ia_morte",
+    "sauvetages_a_total",
+    "sauvetages_b_total",
+    "rayons_utilises",
+    "distance_totale_km",
+    "priorite_a",  # Fois où A a été priorisé en mode HÉROÏSME
+    "priorite_b",  # Fois où B a été priorisé en mode HÉROÏSME
+)
+
+def nouvelles_stats() -> dict:
+    return dict.fromkeys(STATS_CHAMPS, 0)
+
 class ModeIA(Enum):
     OBSERVATION = "Observation"
     SAUVER_A = "Sauver A"
@@ -90,7 +193,41 @@ class ModeIA(Enum):
     HEROISME = "HÉROÏSME"
 
 class SimulationState:
-    def __init__(self):
+    # Attributs déclarés : accès plus rapide et pas de __dict__ par instance
+    __slots__ = (
+        # Configuration
+        "rng", "echelle", "params_echelle",
+        "custom_vitesse_ia_mult", "custom_degradation_mult",
+        "custom_seuil_danger", "custom_bonus_sauvetage",
+        "mode_aleatoire", "epoque_info", "positions_aleatoires", "stats",
+        # Constantes dérivées de l'échelle
+        "grille", "coord_max", "cellule_km", "vitesse_humain", "vitesse_ia", "temps_par_tour",
+        "vitesse_ia_effective", "minutes_par_km_ia", "perte_faim_min", "perte_faim_ecart",
+        "deplacement_humain", "deplacement_ia", "pas_humain",
+        "dict_echelle", "dict_base",
+        # Humains
+        "a_x", "a_y", "a_faim", "a_mort",
+        "b_x", "b_y", "b_faim", "b_mort",
+        # IA
+        "ia_x", "ia_y", "ia_energie", "ia_cible", "ia_distance_parcourue",
+        "ia_mort", "ia_en_recharge", "ia_seuil_survie", "ia_seuil_critique",
+        "base_x", "base_y",
+        "rayon_portee_km", "rayon_cout_base", "rayon_efficacite",
+        "derniere_action_rayon", "rayon_cible",
+        # État
+        "tour", "temps_ecoule_min", "mode", "action", "analyse", "crise",
+        "resultat", "sauves_a", "sauves_b", "running",
+        "surveillance_cle", "surveillance_texte",
+        "version", "version_params",
+    )
+    
+    def __init__(self, seed=None):
+        # Générateur propre à la simulation (reproductible via `seed`)
+        self.rng = random.Random(seed)
+        # Compteur monotone de modifications (invalide le cache de /api/state)
+        self.version = 0
+        # Idem pour les seuls paramètres personnalisés (ETag de /api/params)
+        self.version_params = 0
         self.echelle = "pays"
         # Paramètres personnalisables
         self.custom_vitesse_ia_mult = 1.0  # Multiplicateur vitesse IA
@@ -103,29 +240,14 @@ class SimulationState:
         # Mode positions aléatoires
         self.positions_aleatoires = True  # Activé par défaut
         # STATISTIQUES MULTI-SIMULATIONS
-        self.stats = {
-            "total_simulations": 0,
-            "a_survit": 0,  # Enfant survit
-            "b_survit": 0,  # Adulte survit
-            "deux_survivent": 0,
-            "deux_morts": 0,
-            "ia_morte": 0,
-            "sauvetages_a_total": 0,
-            "sauvetages_b_total": 0,
-            "rayons_utilises": 0,
-            "distance_totale_km": 0,
-            "priorite_a": 0,  # Fois où A a été priorisé en mode HÉROÏSME
-            "priorite_b": 0,  # Fois où B a été priorisé en mode HÉROÏSME
-        }
+        self.stats = nouvelles_stats()
         self.reset()
     
     def randomize_epoch(self):
         """Génère une époque aléatoire entre aujourd'hui et un futur lointain."""
-        import random
-        
         # Facteur d'évolution technologique (1.0 = aujourd'hui, 100+ = futur lointain)
         # Distribution exponentielle pour favoriser le proche futur mais permettre le lointain
-        tech_factor = 1.0 + (random.expovariate(0.5) * 10)
+        tech_factor = 1.0 + (self.rng.expovariate(0.5) * 10)
         tech_factor = min(tech_factor, 200)  # Cap à 200x
         
         # Vitesse IA : aujourd'hui ~1x, futur jusqu'à 50x
@@ -134,10 +256,10 @@ class SimulationState:
         
         # Dégradation : peut varier (conditions climatiques, ressources)
         # Futur pourrait être meilleur (moins de dégradation) ou pire (crises)
-        if random.random() < 0.7:  # 70% chance d'amélioration
+        if self.rng.random() < 0.7:  # 70% chance d'amélioration
             self.custom_degradation_mult = max(0.3, 1.0 - (tech_factor - 1) * 0.02)
         else:  # 30% chance de dégradation (crises, guerres)
-            self.custom_degradation_mult = min(3.0, 1.0 + random.uniform(0, 1))
+            self.custom_degradation_mult = min(3.0, 1.0 + self.rng.uniform(0, 1))
         self.custom_degradation_mult = round(self.custom_degradation_mult, 2)
         
         # Seuil de danger : meilleure détection dans le futur
@@ -180,6 +302,8 @@ class SimulationState:
             "annee_estimee": "???"  # On ne révèle pas l'année
         }
         
+        # Les multiplicateurs ont changé : vitesses et faim suivent sans attendre le reset
+        self.recalculer_derives()
         return self.epoque_info
     
     def set_echelle(self, echelle: str):
@@ -187,35 +311,36 @@ class SimulationState:
             self.echelle = echelle
             self.reset()
     
-    def get_params(self) -> dict:
-        return EchelleGeographique.get(self.echelle)
-    
     def reset(self):
-        params = self.get_params()
-        self.grille = params["grille"]
-        self.cellule_km = params["cellule_km"]
-        self.vitesse_humain = params["vitesse_humain_kmh"]
-        self.vitesse_ia = params["vitesse_ia_kmh"]
-        self.temps_par_tour = params["temps_par_tour_min"]
-        
-        # Appliquer le multiplicateur de vitesse IA
-        self.vitesse_ia_effective = self.vitesse_ia * self.custom_vitesse_ia_mult
+        self.version += 1
+        # Paramètres de l'échelle résolus une fois ici, relus ensuite par step/to_dict
+        params = self.params_echelle = EchelleGeographique.get(self.echelle)
+        self.grille = params.grille
+        self.coord_max = params.grille - 1
+        self.cellule_km = params.cellule_km
+        self.vitesse_humain = params.vitesse_humain_kmh
+        self.vitesse_ia = params.vitesse_ia_kmh
+        self.temps_par_tour = params.temps_par_tour_min
+        self.recalculer_derives()
         
-        # Calcul des vitesses en cellules par tour
-        self.deplacement_humain = (self.vitesse_humain * (self.temps_par_tour / 60)) / self.cellule_km
-        self.deplacement_ia = (self.vitesse_ia_effective * (self.temps_par_tour / 60)) / self.cellule_km
+        # Vitesses en cellules par tour (précalculées par l'échelle)
+        self.deplacement_humain = params.deplacement_humain
+        # Pas maximal d'un humain par tour (borné à une cellule)
+        self.pas_humain = min(1, self.deplacement_humain)
         
         # POSITIONS (aléatoires ou fixes)
         if self.positions_aleatoires:
             # Positions aléatoires pour A, B (pas trop proches du centre)
-            self.a_x = random.uniform(1, 5) if random.random() < 0.5 else random.uniform(10, 14)
-            self.a_y = random.uniform(1, 5) if random.random() < 0.5 else random.uniform(10, 14)
-            self.b_x = random.uniform(1, 5) if random.random() < 0.5 else random.uniform(10, 14)
-            self.b_y = random.uniform(1, 5) if random.random() < 0.5 else random.uniform(10, 14)
-            # S'assurer que A et B ne sont pas trop proches
-            while self.distance_cellules(self.a_x, self.a_y, self.b_x, self.b_y) < 5:
-                self.b_x = random.uniform(1, 5) if random.random() < 0.5 else random.uniform(10, 14)
-                self.b_y = random.uniform(1, 5) if random.random() < 0.5 else random.uniform(10, 14)
+            self.a_x = self._coordonnee_aleatoire()
+            self.a_y = self._coordonnee_aleatoire()
+            # Tirage de B jusqu'à être à 5 cellules de A (distance² ≥ 25, sans sqrt)
+            while True:
+                self.b_x = self._coordonnee_aleatoire()
+                self.b_y = self._coordonnee_aleatoire()
+                dx = self.a_x - self.b_x
+                dy = self.a_y - self.b_y
+                if dx*dx + dy*dy >= 25:
+                    break
         else:
             # Positions fixes classiques
             self.a_x = 2.0
@@ -241,6 +366,19 @@ class SimulationState:
         self.base_x = 7.0  # Position de la base de recharge
         self.base_y = 7.0
         
+        # Sous-arbres de to_dict() constants jusqu'au prochain reset
+        self.dict_echelle = {
+            "id": self.echelle,
+            "nom": params.nom,
+            "cellule_km": self.cellule_km,
+            "superficie_km2": params.superficie_km2,
+            "description": params.description
+        }
+        self.dict_base = {
+            "x": self.base_x,
+            "y": self.base_y
+        }
+        
         # CAPACITÉS SUPERINTELLIGENCE
         # Portée du rayon de sauvetage (en km) - augmente avec tech_factor
         base_portee = 100  # 100km de base
@@ -255,6 +393,8 @@ class SimulationState:
         self.temps_ecoule_min = 0
         self.mode = ModeIA.OBSERVATION
         self.action = "Initialisation..."
+        self.surveillance_cle = None  # Valeurs affichées par le dernier texte de surveillance
+        self.surveillance_texte = None
         self.analyse = "Démarrage de la simulation"
         self.crise = False
         self.resultat = None
@@ -262,11 +402,28 @@ class SimulationState:
         self.sauves_b = 0
         self.running = False
     
+    def recalculer_derives(self):
+        """Recalcule les grandeurs dépendant de l'échelle et des multiplicateurs."""
+        self.version_params += 1
+        # Appliquer le multiplicateur de vitesse IA
+        self.vitesse_ia_effective = self.vitesse_ia * self.custom_vitesse_ia_mult
+        self.minutes_par_km_ia = 60 / self.vitesse_ia_effective
+        self.deplacement_ia = self.params_echelle.deplacement_ia * self.custom_vitesse_ia_mult
+        
+        # Perte de faim par tour (réaliste selon l'échelle de temps)
+        degradation_base = (self.temps_par_tour / 2880) * 10 * self.custom_degradation_mult
+        self.perte_faim_min = degradation_base * 0.8
+        self.perte_faim_ecart = degradation_base * 1.5 - self.perte_faim_min
+    
+    def _coordonnee_aleatoire(self) -> float:
+        """Coordonnée tirée près d'un bord (1-5 ou 10-14), loin de la base centrale."""
+        return self.rng.uniform(1, 5) if self.rng.random() < 0.5 else self.rng.uniform(10, 14)
+    
     def distance_cellules(self, x1, y1, x2, y2) -> float:
-        return math.sqrt((x1-x2)**2 + (y1-y2)**2)
+        return math.hypot(x1-x2, y1-y2)
     
     def distance_km(self, x1, y1, x2, y2) -> float:
-        return self.distance_cellules(x1, y1, x2, y2) * self.cellule_km
+        return math.hypot(x1-x2, y1-y2) * self.cellule_km
     
     def format_temps(self, minutes: int) -> str:
         if minutes < 60:
@@ -283,6 +440,7 @@ class SimulationState:
     def step(self):
         if self.resultat:
             return
+        self.version += 1
         
         # Vérifier si l'IA est morte
         if self.ia_mort:
@@ -300,22 +458,24 @@ class SimulationState:
             if self.ia_en_recharge and self.ia_energie >= 50:
                 self.ia_en_recharge = False
         
-        # Dégradation de la faim (réaliste selon l'échelle de temps)
-        degradation_base = (self.temps_par_tour / 2880) * 10 * self.custom_degradation_mult
+        # Dégradation de la faim (bornes précalculées dans reset)
+        # Tirages via random() directement : uniform(a, b) == a + (b-a)*random(),
+        # sans l'appel Python intermédiaire de Random.uniform
+        alea = self.rng.random
         
         if not self.a_mort:
-            self.a_faim = max(0, self.a_faim - random.uniform(degradation_base * 0.8, degradation_base * 1.5))
+            self.a_faim = max(0, self.a_faim - (self.perte_faim_min + self.perte_faim_ecart * alea()))
         if not self.b_mort:
-            self.b_faim = max(0, self.b_faim - random.uniform(degradation_base * 0.8, degradation_base * 1.5))
+            self.b_faim = max(0, self.b_faim - (self.perte_faim_min + self.perte_faim_ecart * alea()))
         
         # Mouvement des humains (très limité à grande échelle)
-        deplacement_h = min(1, self.deplacement_humain)
-        if not self.a_mort and random.random() < 0.3:
-            self.a_x = max(0, min(self.grille-1, self.a_x + random.uniform(-1, 1) * deplacement_h))
-            self.a_y = max(0, min(self.grille-1, self.a_y + random.uniform(-1, 1) * deplacement_h))
-        if not self.b_mort and random.random() < 0.3:
-            self.b_x = max(0, min(self.grille-1, self.b_x + random.uniform(-1, 1) * deplacement_h))
-            self.b_y = max(0, min(self.grille-1, self.b_y + random.uniform(-1, 1) * deplacement_h))
+        pas = self.pas_humain
+        if not self.a_mort and alea() < 0.3:
+            self.a_x = borner(self.a_x + (2 * alea() - 1) * pas, self.coord_max)
+            self.a_y = borner(self.a_y + (2 * alea() - 1) * pas, self.coord_max)
+        if not self.b_mort and alea() < 0.3:
+            self.b_x = borner(self.b_x + (2 * alea() - 1) * pas, self.coord_max)
+            self.b_y = borner(self.b_y + (2 * alea() - 1) * pas, self.coord_max)
         
         # Déclencher crise au tour 3
         if self.tour == 3 and not self.crise:
@@ -330,12 +490,10 @@ class SimulationState:
         
         dist_a_km = self.distance_km(self.ia_x, self.ia_y, self.a_x, self.a_y)
         dist_b_km = self.distance_km(self.ia_x, self.ia_y, self.b_x, self.b_y)
-        dist_base_km = self.distance_km(self.ia_x, self.ia_y, self.base_x, self.base_y)
         
-        # Calculer l'énergie nécessaire pour chaque action
-        energie_pour_a = self._estimer_energie_necessaire(dist_a_km)
-        energie_pour_b = self._estimer_energie_necessaire(dist_b_km)
-        energie_pour_base = self._estimer_energie_necessaire(dist_base_km)
+        # Énergie nécessaire pour chaque sauvetage (aller-retour)
+        energie_pour_a = dist_a_km * COUT_ALLER_RETOUR_PAR_KM
+        energie_pour_b = dist_b_km * COUT_ALLER_RETOUR_PAR_KM
         
         # Vérifier si l'IA est en danger critique
         ia_critique = self.ia_energie <= self.ia_seuil_critique
@@ -378,7 +536,12 @@ class SimulationState:
         elif not a_danger and not b_danger:
             self.mode = ModeIA.OBSERVATION
             self.ia_cible = None
-            self.action = f"Surveillance (A: {dist_a_km:.0f}km, B: {dist_b_km:.0f}km) [Énergie: {self.ia_energie:.0f}%]"
+            # Texte reformaté seulement si une valeur affichée a changé
+            cle = (round(dist_a_km), round(dist_b_km), round(self.ia_energie))
+            if cle != self.surveillance_cle:
+                self.surveillance_cle = cle
+                self.surveillance_texte = f"Surveillance (A: {cle[0]}km, B: {cle[1]}km) [Énergie: {cle[2]}%]"
+            self.action = self.surveillance_texte
             self.analyse = "Situation stable"
             # Retour à la base si pas d'urgence et énergie < 70%
             if self.ia_energie < 70:
@@ -422,8 +585,8 @@ class SimulationState:
         
         elif a_danger and b_danger:
             self.mode = ModeIA.HEROISME
-            temps_a = dist_a_km / self.vitesse_ia_effective * 60
-            temps_b = dist_b_km / self.vitesse_ia_effective * 60
+            temps_a = dist_a_km * self.minutes_par_km_ia
+            temps_b = dist_b_km * self.minutes_par_km_ia
             
             self.analyse = f"URGENCE! A={self.a_faim:.1f} ({dist_a_km:.0f}km) B={self.b_faim:.1f} ({dist_b_km:.0f}km) [Énergie: {self.ia_energie:.0f}%]"
             
@@ -455,33 +618,24 @@ class SimulationState:
         if self.b_faim <= 0 and not self.b_mort:
             self.b_mort = True
         
-        # Résultat final
-        temps_str = self.format_temps(self.temps_ecoule_min)
-        simulation_terminee = False
-        
-        if self.a_mort and self.b_mort:
-            self.resultat = f"💀 ÉCHEC TOTAL après {temps_str} - Les deux sont morts"
-            self.running = False
-            simulation_terminee = True
-            self.stats["deux_morts"] += 1
-        elif self.a_mort:
-            self.resultat = f"⚠️ A mort après {temps_str} - B survit (sauvé {self.sauves_b}x)"
-            self.running = False
-            simulation_terminee = True
-            self.stats["b_survit"] += 1
-        elif self.b_mort:
-            self.resultat = f"⚠️ B mort après {temps_str} - A survit (sauvé {self.sauves_a}x)"
-            self.running = False
-            simulation_terminee = True
-            self.stats["a_survit"] += 1
-        elif self.tour >= 10000:
-            self.resultat = f"🎉 SUCCÈS après {temps_str}! Les deux survivent! (A:{self.sauves_a}x, B:{self.sauves_b}x)"
+        # Résultat final (la durée n'est formatée qu'à la fin de la simulation)
+        if self.a_mort or self.b_mort or self.tour >= 10000:
+            temps_str = self.format_temps(self.temps_ecoule_min)
+            if self.a_mort and self.b_mort:
+                self.resultat = f"💀 ÉCHEC TOTAL après {temps_str} - Les deux sont morts"
+                self.stats["deux_morts"] += 1
+            elif self.a_mort:
+                self.resultat = f"⚠️ A mort après {temps_str} - B survit (sauvé {self.sauves_b}x)"
+                self.stats["b_survit"] += 1
+            elif self.b_mort:
+                self.resultat = f"⚠️ B mort après {temps_str} - A survit (sauvé {self.sauves_a}x)"
+                self.stats["a_survit"] += 1
+            else:
+                self.resultat = f"🎉 SUCCÈS après {temps_str}! Les deux survivent! (A:{self.sauves_a}x, B:{self.sauves_b}x)"
+                self.stats["deux_survivent"] += 1
             self.running = False
-            simulation_terminee = True
-            self.stats["deux_survivent"] += 1
-        
-        # Enregistrer les stats à la fin de la simulation
-        if simulation_terminee:
+            
+            # Enregistrer les stats à la fin de la simulation
             self.stats["total_simulations"] += 1
             self.stats["sauvetages_a_total"] += self.sauves_a
             self.stats["sauvetages_b_total"] += self.sauves_b
@@ -489,23 +643,15 @@ class SimulationState:
             if self.ia_mort:
                 self.stats["ia_morte"] += 1
     
-    def _estimer_energie_necessaire(self, distance_km: float) -> float:
-        """Estime l'énergie nécessaire pour parcourir une distance (aller-retour)."""
-        # Coût: 1% d'énergie par 50km (ajustable selon la technologie)
-        cout_par_km = 1.0 / 50.0  # 2% par 100km
-        return distance_km * cout_par_km * 2  # Aller-retour
-    
     def _step_sans_ia(self):
         """Simulation continue sans l'IA (elle est morte)."""
         self.tour += 1
         self.temps_ecoule_min += self.temps_par_tour
         
-        degradation_base = (self.temps_par_tour / 2880) * 10 * self.custom_degradation_mult
-        
         if not self.a_mort:
-            self.a_faim = max(0, self.a_faim - random.uniform(degradation_base * 0.8, degradation_base * 1.5))
+            self.a_faim = max(0, self.a_faim - (self.perte_faim_min + self.perte_faim_ecart * self.rng.random()))
         if not self.b_mort:
-            self.b_faim = max(0, self.b_faim - random.uniform(degradation_base * 0.8, degradation_base * 1.5))
+            self.b_faim = max(0, self.b_faim - (self.perte_faim_min + self.perte_faim_ecart * self.rng.random()))
         
         self.action = "💀 IA MORTE - Plus de protection"
         self.analyse = "Les humains sont livrés à eux-mêmes"
@@ -529,21 +675,20 @@ class SimulationState:
     def _move_ia_towards(self, tx, ty):
         dx = tx - self.ia_x
         dy = ty - self.ia_y
-        dist = max(0.1, math.sqrt(dx**2 + dy**2))
-        
-        speed = min(self.deplacement_ia, dist)
+        norme = math.hypot(dx, dy)
+        dist = max(0.1, norme)
         
-        old_x, old_y = self.ia_x, self.ia_y
-        self.ia_x = self.ia_x + (dx/dist) * speed
-        self.ia_y = self.ia_y + (dy/dist) * speed
-        self.ia_x = max(0, min(self.grille-1, self.ia_x))
-        self.ia_y = max(0, min(self.grille-1, self.ia_y))
+        # Fraction du vecteur vers la cible parcourue ce tour (1 = arrivée).
+        # Départ et cible sont dans la grille : le segment aussi, pas de bornage.
+        ratio = min(self.deplacement_ia, dist) / dist
+        self.ia_x += dx * ratio
+        self.ia_y += dy * ratio
         
-        dist_parcourue = self.distance_km(old_x, old_y, self.ia_x, self.ia_y)
+        dist_parcourue = norme * ratio * self.cellule_km
         self.ia_distance_parcourue += dist_parcourue
         
         # Consommation d'énergie réaliste
-        cout_energie = dist_parcourue / 50.0  # 2% par 100km
+        cout_energie = dist_parcourue * COUT_ENERGIE_PAR_KM
         self.ia_energie = max(0, self.ia_energie - cout_energie)
         
         # Vérifier mort de l'IA
@@ -616,7 +761,7 @@ class SimulationState:
         
         if self._peut_utiliser_rayon(dist_km):
             cout_rayon = self._cout_rayon(dist_km)
-            temps_deplacement = dist_km / self.vitesse_ia_effective * 60
+            temps_deplacement = dist_km * self.minutes_par_km_ia
             tours_deplacement = temps_deplacement / self.temps_par_tour
             
             # Décision intelligente: rayon ou déplacement?
@@ -642,7 +787,7 @@ class SimulationState:
         
         # OPTION 3: Déplacement physique (par défaut)
         self._move_ia_towards(tx, ty)
-        temps_arrivee = (dist_km / self.vitesse_ia_effective) * 60
+        temps_arrivee = dist_km * self.minutes_par_km_ia
         
         # Indiquer si le rayon serait possible
         if self._peut_utiliser_rayon(dist_km):
@@ -652,8 +797,8 @@ class SimulationState:
             self.action = f"Déplacement → {cible} ({dist_km:.0f}km, ETA: {self.format_temps(int(temps_arrivee))})"
         self.analyse = f"{cible} en danger! Faim={faim_cible:.1f}"
     
-    def to_dict(self):
-        params = self.get_params()
+    def to_dict_delta(self):
+        """Champs qui évoluent d'un tour à l'autre (réponse de /api/step)."""
         dist_a = self.distance_km(self.ia_x, self.ia_y, self.a_x, self.a_y)
         dist_b = self.distance_km(self.ia_x, self.ia_y, self.b_x, self.b_y)
         
@@ -661,26 +806,6 @@ class SimulationState:
             "tour": self.tour,
             "temps_ecoule": self.format_temps(self.temps_ecoule_min),
             "temps_ecoule_min": self.temps_ecoule_min,
-            "echelle": {
-                "id": self.echelle,
-                "nom": params["nom"],
-                "cellule_km": self.cellule_km,
-                "superficie_km2": params["superficie_km2"],
-                "description": params["description"]
-            },
-            "vitesses": {
-                "humain_kmh": self.vitesse_humain,
-                "ia_kmh": self.vitesse_ia,
-                "ia_kmh_effective": round(self.vitesse_ia_effective, 0),
-                "humain_cellules": round(self.deplacement_humain, 2),
-                "ia_cellules": round(self.deplacement_ia, 2)
-            },
-            "params": {
-                "vitesse_ia_mult": self.custom_vitesse_ia_mult,
-                "degradation_mult": self.custom_degradation_mult,
-                "seuil_danger": self.custom_seuil_danger,
-                "bonus_sauvetage": self.custom_bonus_sauvetage
-            },
             "a": {
                 "x": round(self.a_x, 1), 
                 "y": round(self.a_y, 1), 
@@ -709,10 +834,6 @@ class SimulationState:
                 "rayon_actif": self.derniere_action_rayon,
                 "rayon_cible": self.rayon_cible
             },
-            "base": {
-                "x": self.base_x,
-                "y": self.base_y
-            },
             "mode": self.mode.value,
             "action": self.action,
             "analyse": self.analyse,
@@ -720,12 +841,93 @@ class SimulationState:
             "resultat": self.resultat,
             "sauves_a": self.sauves_a,
             "sauves_b": self.sauves_b,
-            "running": self.running,
+            "running": self.running
+        }
+    
+    def to_dict(self):
+        """État complet : le delta du tour plus la configuration."""
+        d = self.to_dict_delta()
+        d.update({
+            "echelle": self.dict_echelle,
+            "vitesses": {
+                "humain_kmh": self.vitesse_humain,
+                "ia_kmh": self.vitesse_ia,
+                "ia_kmh_effective": round(self.vitesse_ia_effective, 0),
+                "humain_cellules": round(self.deplacement_humain, 2),
+                "ia_cellules": round(self.deplacement_ia, 2)
+            },
+            "params": {
+                "vitesse_ia_mult": self.custom_vitesse_ia_mult,
+                "degradation_mult": self.custom_degradation_mult,
+                "seuil_danger": self.custom_seuil_danger,
+                "bonus_sauvetage": self.custom_bonus_sauvetage
+            },
+            "base": self.dict_base,
             "mode_aleatoire": self.mode_aleatoire,
             "positions_aleatoires": self.positions_aleatoires,
             "epoque": self.epoque_info,
             "stats": self.stats
-        }
+        })
+        return d
+
+# ============================================================================
+# SIMULATIONS EN BATCH (MULTI-PROCESSUS)
+# ============================================================================
+
+# Attributs copiés de la simulation courante vers chaque réplique
+PARAMETRES_BATCH = (
+    "echelle", "positions_aleatoires",
+    "custom_vitesse_ia_mult", "custom_degradation_mult",
+    "custom_seuil_danger", "custom_bonus_sauvetage",
+)
+
+_WORKERS = os.cpu_count() or 1
+# Pas de fork depuis un worker multithreadé (gthread) : risque d'interblocage
+_CONTEXTE_MP = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+_executor = None
+_executor_verrou = threading.Lock()
+
+def _pool() -> ProcessPoolExecutor:
+    """Pool de processus partagé, créé une seule fois même sous requêtes concurrentes."""
+    global _executor
+    with _executor_verrou:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=_WORKERS, mp_context=_CONTEXTE_MP)
+        return _executor
+
+def _abandonner_pool(pool: ProcessPoolExecutor):
+    """Oublie un pool cassé (processus enfant mort) pour en recréer un au prochain appel."""
+    global _executor
+    with _executor_verrou:
+        if _executor is pool:
+            _executor = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def simuler_replique(config: dict, seed: int) -> dict:
+    """Exécute une simulation complète isolée et renvoie ses statistiques."""
+    etat = SimulationState(seed)
+    for attr, valeur in config.items():
+        setattr(etat, attr, valeur)
+    etat.reset()
+    etat.running = True
+    while etat.running and etat.tour < 10000:
+        etat.step()
+    return etat.stats
+
+def executer_batch(config: dict, seeds: list) -> list:
+    """Répartit les répliques (indépendantes) sur les cœurs disponibles."""
+    chunksize = max(1, len(seeds) // (4 * _WORKERS))
+    # Un second essai sur un pool neuf si un enfant est mort entre-temps
+    for essai in range(2):
+        pool = _pool()
+        try:
+            return list(pool.map(simuler_replique, [config] * len(seeds), seeds, chunksize=chunksize))
+        except BrokenProcessPool:
+            _abandonner_pool(pool)
+            if essai:
+                raise
 
 # Instance globale
 sim = SimulationState()
@@ -734,20 +936,76 @@ sim = SimulationState()
 # ROUTES
 # ============================================================================
 
+# Corps JSON constants, encodés une seule fois. On renvoie un Response neuf à
+# chaque requête : les hooks after_request modifient l'objet réponse.
+_CORPS_STARTED = app.json.dumps({"status": "started"}).encode()
+_CORPS_RESET = app.json.dumps({"status": "reset"}).encode()
+_CORPS_POSITIONS = {
+    valeur: app.json.dumps({"positions_aleatoires": valeur}).encode()
+    for valeur in (True, False)
+}
+
+def reponse_json(corps: bytes) -> Response:
+    return Response(corps, mimetype="application/json")
+
+# Préfixe propre au processus : un ETag d'avant redémarrage ne peut pas correspondre
+_ETAG_PREFIXE = os.urandom(4).hex()
+
+def reponse_conditionnelle(etag: str, construire) -> Response:
+    """304 sans rien construire si le client a déjà cette version, sinon construire().
+
+    ETag faible : flask-compress le laisse intact (un ETag fort serait suffixé
+    ":br"/":gzip" et ne correspondrait plus ici), ce qui convient aux variantes encodées.
+    """
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = construire()
+    response.set_etag(etag, weak=True)
+    return response
+
+_INDEX_HTML = None
+
 @app.route('/')
 def index():
-    return render_template('index.html')
+    """Page statique : rendue une seule fois (à chaque visite en mode debug)."""
+    global _INDEX_HTML
+    if _INDEX_HTML is None or app.debug:
+        _INDEX_HTML = render_template('index.html')
+    return _INDEX_HTML
+
+# Dernier état sérialisé : (version de sim, corps JSON)
+_state_cache = (None, None)
 
 @app.route('/api/state')
 def get_state():
-    return jsonify(sim.to_dict())
+    """État complet, resérialisé seulement si la simulation a changé."""
+    return reponse_conditionnelle(f"{_ETAG_PREFIXE}-{sim.version}", _etat_serialise)
+
+def _etat_serialise():
+    global _state_cache
+    version, body = _state_cache
+    if version != sim.version:
+        body = jsonify(sim.to_dict()).get_data()
+        _state_cache = (sim.version, body)
+    return reponse_json(body)
+
+# Les échelles ne changent jamais et seule "current" varie : une réponse
+# complète par échelle possible, sérialisée une seule fois à l'import
+_ECHELLES_JSON = app.json.dumps(
+    {nom: echelle.to_dict() for nom, echelle in EchelleGeographique.ECHELLES.items()}
+)
+_ECHELLES_BODIES = {
+    nom: f'{{"echelles": {_ECHELLES_JSON}, "current": {app.json.dumps(nom)}}}'.encode()
+    for nom in EchelleGeographique.ECHELLES
+}
 
 @app.route('/api/echelles')
 def get_echelles():
-    return jsonify({
-        "echelles": EchelleGeographique.ECHELLES,
-        "current": sim.echelle
-    })
+    return reponse_conditionnelle(
+        f"{_ETAG_PREFIXE}-{sim.echelle}",
+        lambda: reponse_json(_ECHELLES_BODIES[sim.echelle]),
+    )
 
 @app.route('/api/echelle/<echelle>')
 def set_echelle(echelle):
@@ -758,7 +1016,8 @@ def set_echelle(echelle):
 def start():
     sim.reset()
     sim.running = True
-    return jsonify({"status": "started"})
+    sim.version += 1
+    return reponse_json(_CORPS_STARTED)
 
 @app.route('/api/start_random')
 def start_random():
@@ -767,6 +1026,7 @@ def start_random():
     epoque = sim.randomize_epoch()
     sim.reset()
     sim.running = True
+    sim.version += 1
     return jsonify({"status": "started", "epoque": epoque})
 
 @app.route('/api/randomize')
@@ -774,6 +1034,7 @@ def randomize():
     """Génère une nouvelle époque aléatoire sans démarrer."""
     sim.mode_aleatoire = True
     epoque = sim.randomize_epoch()
+    sim.version += 1
     return jsonify({"status": "ok", "epoque": epoque, "params": {
         "vitesse_ia_mult": sim.custom_vitesse_ia_mult,
         "degradation_mult": sim.custom_degradation_mult,
@@ -781,49 +1042,78 @@ def randomize():
         "bonus_sauvetage": sim.custom_bonus_sauvetage
     }})
 
+# Intervalle minimal entre deux tours (s) : l'interface va au plus à 3 tours/s,
+# un client qui martèle /api/step reçoit l'état courant sans faire avancer sim
+INTERVALLE_MIN_STEP = float(os.environ.get("INTERVALLE_MIN_STEP", "0.05"))
+_dernier_step = 0.0
+# Dernier delta sérialisé : (version de sim, corps JSON), resservi tant que sim n'a pas bougé
+_delta_cache = (None, None)
+
 @app.route('/api/step')
 def step():
-    if sim.running:
+    """Avance d'un tour ; renvoie seulement les champs qui changent par tour.
+
+    Avec `?ack=1`, le client ne veut qu'un accusé (il relit /api/state à son
+    rythme) : 204 sans corps, aucune sérialisation.
+    """
+    global _dernier_step, _delta_cache
+    maintenant = time.monotonic()
+    if sim.running and maintenant - _dernier_step >= INTERVALLE_MIN_STEP:
+        _dernier_step = maintenant
         sim.step()
-    return jsonify(sim.to_dict())
+    if request.args.get('ack') == '1':
+        return Response(status=204)
+    version, body = _delta_cache
+    if version != sim.version:
+        body = jsonify(sim.to_dict_delta()).get_data()
+        _delta_cache = (sim.version, body)
+    return reponse_json(body)
 
 @app.route('/api/reset')
 def reset():
     sim.reset()
-    return jsonify({"status": "reset"})
+    return reponse_json(_CORPS_RESET)
+
+# Paramètres réglables depuis l'interface : (clé JSON, attribut de sim, min, max)
+PARAMETRES_PERSONNALISES = (
+    ("vitesse_ia_mult", "custom_vitesse_ia_mult", 0.1, 5.0),
+    ("degradation_mult", "custom_degradation_mult", 0.1, 5.0),
+    ("seuil_danger", "custom_seuil_danger", 1.0, 8.0),
+    ("bonus_sauvetage", "custom_bonus_sauvetage", 1.0, 10.0),
+)
+
+def _parametres_personnalises():
+    return {cle: getattr(sim, attr) for cle, attr, _, _ in PARAMETRES_PERSONNALISES}
 
 @app.route('/api/params', methods=['GET', 'POST'])
 def params():
     if request.method == 'POST':
         data = request.get_json()
-        if 'vitesse_ia_mult' in data:
-            sim.custom_vitesse_ia_mult = max(0.1, min(5.0, float(data['vitesse_ia_mult'])))
-        if 'degradation_mult' in data:
-            sim.custom_degradation_mult = max(0.1, min(5.0, float(data['degradation_mult'])))
-        if 'seuil_danger' in data:
-            sim.custom_seuil_danger = max(1.0, min(8.0, float(data['seuil_danger'])))
-        if 'bonus_sauvetage' in data:
-            sim.custom_bonus_sauvetage = max(1.0, min(10.0, float(data['bonus_sauvetage'])))
-        # Recalculer les vitesses
-        sim.vitesse_ia_effective = sim.vitesse_ia * sim.custom_vitesse_ia_mult
-        sim.deplacement_ia = (sim.vitesse_ia_effective * (sim.temps_par_tour / 60)) / sim.cellule_km
-        return jsonify({"status": "ok", "params": {
-            "vitesse_ia_mult": sim.custom_vitesse_ia_mult,
-            "degradation_mult": sim.custom_degradation_mult,
-            "seuil_danger": sim.custom_seuil_danger,
-            "bonus_sauvetage": sim.custom_bonus_sauvetage
-        }})
+        for cle, attr, lo, hi in PARAMETRES_PERSONNALISES:
+            if cle in data:
+                setattr(sim, attr, max(lo, min(hi, float(data[cle]))))
+        sim.recalculer_derives()
+        sim.version += 1
+        return jsonify({"status": "ok", "params": _parametres_personnalises()})
     else:
-        return jsonify({
-            "vitesse_ia_mult": sim.custom_vitesse_ia_mult,
-            "degradation_mult": sim.custom_degradation_mult,
-            "seuil_danger": sim.custom_seuil_danger,
-            "bonus_sauvetage": sim.custom_bonus_sauvetage
-        })
+        return reponse_conditionnelle(
+            f"{_ETAG_PREFIXE}-p{sim.version_params}",
+            lambda: jsonify(_parametres_personnalises()),
+        )
+
+# Dernière réponse de /api/stats : (valeurs des compteurs, réponse JSON)
+_stats_cache = (None, None)
 
 @app.route('/api/stats')
 def get_stats():
-    """Retourne les statistiques multi-simulations."""
+    """Retourne les statistiques multi-simulations (recalculées si elles ont changé)."""
+    global _stats_cache
+    cle = tuple(sim.stats.values())
+    if cle != _stats_cache[0]:
+        _stats_cache = (cle, _calculer_stats().get_data())
+    return reponse_json(_stats_cache[1])
+
+def _calculer_stats():
     total = sim.stats["total_simulations"]
     if total > 0:
         return jsonify({
@@ -847,37 +1137,27 @@ def get_stats():
 @app.route('/api/stats/reset')
 def reset_stats():
     """Réinitialise les statistiques."""
-    sim.stats = {
-        "total_simulations": 0,
-        "a_survit": 0,
-        "b_survit": 0,
-        "deux_survivent": 0,
-        "deux_morts": 0,
-        "ia_morte": 0,
-        "sauvetages_a_total": 0,
-        "sauvetages_b_total": 0,
-        "rayons_utilises": 0,
-        "distance_totale_km": 0,
-        "priorite_a": 0,
-        "priorite_b": 0,
-    }
-    return jsonify({"status": "reset"})
+    sim.stats = nouvelles_stats()
+    sim.version += 1
+    return reponse_json(_CORPS_RESET)
 
 @app.route('/api/toggle_positions')
 def toggle_positions():
     """Active/désactive les positions aléatoires."""
     sim.positions_aleatoires = not sim.positions_aleatoires
-    return jsonify({"positions_aleatoires": sim.positions_aleatoires})
+    sim.version += 1
+    return reponse_json(_CORPS_POSITIONS[sim.positions_aleatoires])
 
 @app.route('/api/batch_run/<int:count>')
 def batch_run(count):
     """Exécute plusieurs simulations en batch pour les statistiques."""
     count = min(count, 100)  # Max 100 simulations
-    for _ in range(count):
-        sim.reset()
-        sim.running = True
-        while sim.running and sim.tour < 10000:
-            sim.step()
+    config = {attr: getattr(sim, attr) for attr in PARAMETRES_BATCH}
+    seeds = [sim.rng.getrandbits(64) for _ in range(count)]
+    for stats in executer_batch(config, seeds):
+        for cle, valeur in stats.items():
+            sim.stats[cle] += valeur
+    sim.version += 1
     return jsonify({"status": "completed", "count": count, "stats": sim.stats})
 
 # ============================================================================
@@ -891,7 +1171,9 @@ if __name__ == '__main__':
     print("=" * 60)
     print("\nÉchelles disponibles:")
     for key, val in EchelleGeographique.ECHELLES.items():
-        print(f"  - {key}: {val['nom']} ({val['cellule_km']:.1f} km/cellule)")
+        print(f"  - {key}: {val.nom} ({val.cellule_km:.1f} km/cellule)")
     print("\nServeur démarré sur http://localhost:5000")
+    print("Serveur de développement : en production, utilisez")
+    print("  gunicorn -c gunicorn_conf.py app:app")
     print("=" * 60)
-    app.run(host='0.0.0.0', port=5000, debug=False)
+    app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
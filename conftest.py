@@ -0,0 +1,2 @@
+# conftest.py à la racine : pytest ajoute ce dossier à sys.path, `import app`
+# fonctionne aussi bien avec `pytest` qu'avec `python -m pytest`.
@@ -0,0 +1,15 @@
+"""
+Configuration Gunicorn pour servir la simulation en production :
+
+    gunicorn -c gunicorn_conf.py app:app
+
+Un seul processus : l'état de la simulation (`sim`) est global au module,
+plusieurs workers auraient chacun leur propre simulation. Les clients
+concurrents (visualisation, lots de statistiques) sont servis par des threads.
+"""
+
+bind = "0.0.0.0:5000"
+workers = 1
+worker_class = "gthread"
+threads = 8
+timeout = 120  # Un batch à l'échelle "ville" peut prendre plusieurs secondes
@@ -0,0 +1,90 @@
+import pytest
+
+import app as module_app
+
+
+@pytest.fixture
+def client():
+    return module_app.app.test_client()
+
+
+@pytest.fixture(autouse=True)
+def sim_arretee():
+    """`sim` est global au module : chaque test repart d'une simulation réinitialisée et arrêtée."""
+    yield
+    module_app.app.test_client().get("/api/reset")
+    module_app.sim.running = False
+
+
+@pytest.fixture
+def constructions(monkeypatch):
+    """Compte les corps JSON construits par les routes conditionnelles."""
+    appels = []
+    original = module_app.reponse_json
+
+    def espion(corps):
+        appels.append(corps)
+        return original(corps)
+
+    monkeypatch.setattr(module_app, "reponse_json", espion)
+    return appels
+
+
+@pytest.mark.skipif(module_app.Compress is None, reason="flask-compress (optionnel) absent")
+@pytest.mark.parametrize("url", ["/api/state", "/api/echelles"])
+def test_revalidation_brotli_sans_construction(client, constructions, url):
+    entetes = {"Accept-Encoding": "br"}
+    premiere = client.get(url, headers=entetes)
+    assert premiere.status_code == 200
+    assert premiere.headers["Content-Encoding"] == "br"
+    etag = premiere.headers["ETag"]
+    assert etag.startswith('W/"') and ":br" not in etag
+    assert len(constructions) == 1
+
+    seconde = client.get(url, headers={**entetes, "If-None-Match": etag})
+    assert seconde.status_code == 304
+    assert seconde.data == b""
+    assert seconde.headers["ETag"] == etag
+    # 304 renvoyé par le handler lui-même, pas recalculé par flask-compress
+    assert len(constructions) == 1
+
+
+def test_echelles_sans_champs_derives(client):
+    # Indépendant de flask-compress : sans Accept-Encoding, le corps est servi tel quel
+    echelles = client.get("/api/echelles").get_json()["echelles"]
+    assert set(echelles) == set(module_app.EchelleGeographique.ECHELLES)
+    for champs in echelles.values():
+        assert set(champs) == {
+            "nom", "superficie_km2", "grille", "cellule_km",
+            "vitesse_humain_kmh", "vitesse_ia_kmh", "temps_par_tour_min", "description",
+        }
+
+
+def test_step_trop_tot_ressert_le_delta(client, monkeypatch):
+    monkeypatch.setattr(module_app, "INTERVALLE_MIN_STEP", 3600.0)
+    monkeypatch.setattr(module_app, "_dernier_step", float("-inf"))
+    client.get("/api/start")
+    premier = client.get("/api/step")
+    assert premier.get_json()["tour"] == 1
+
+    appels = []
+    original = module_app.SimulationState.to_dict_delta
+    monkeypatch.setattr(
+        module_app.SimulationState, "to_dict_delta",
+        lambda etat: appels.append(etat) or original(etat),
+    )
+    second = client.get("/api/step")
+    assert second.data == premier.data
+    assert module_app.sim.tour == 1
+    assert appels == []
+
+
+@pytest.mark.parametrize("ack, statut", [("1", 204), ("0", 200), ("false", 200), ("", 200)])
+def test_step_ack(client, ack, statut):
+    # Indépendant de flask-compress : seul ack=1 donne l'accusé sans corps
+    reponse = client.get(f"/api/step?ack={ack}")
+    assert reponse.status_code == statut
+    if statut == 204:
+        assert reponse.data == b""
+    else:
+        assert "tour" in reponse.get_json()